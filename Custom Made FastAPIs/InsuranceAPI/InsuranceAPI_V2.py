@@ -1,8 +1,27 @@
-from fastapi import FastAPI
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic_setup import UserData
 from response_model import PredictedResponse
 from model_functions import predict_from_model, MODEL_VERSION, model
+from prediction_logger import PredictionLogger
+from feature_monitor import WindowedProfile, compare_profiles, load_reference
+
+prediction_logger = PredictionLogger(model_version=MODEL_VERSION)
+live_profile = WindowedProfile()
+reference_profile = load_reference()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prediction_logger.start()
+    live_profile.start_publishing()
+    yield
+    # Both stops wait on background threads; keep that off the event loop.
+    await asyncio.to_thread(prediction_logger.stop)
+    await asyncio.to_thread(live_profile.stop_publishing)
 
 app = FastAPI(
     title="🛡️ Insurance Premium Category Predictor API",
@@ -16,10 +35,13 @@ app = FastAPI(
     - City tier classification for regional risk modeling
     - Occupation-based risk segmentation
     - Seamless integration with trained ML models
+    - Non-blocking prediction logging for audits and retraining
+    - Live feature and output drift monitoring against the training data
 
     Built for speed. Designed for clarity. Ready for production.
     """.strip(),
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
 @app.get("/")
@@ -30,6 +52,29 @@ def home():
 def health_check():
     return {"status": "OK", "version": MODEL_VERSION, "model_version": model is not None}
 
+@app.get("/monitoring/prediction-log")
+def prediction_log_stats():
+    return prediction_logger.stats()
+
+@app.get("/monitoring/drift")
+def drift_report():
+    if reference_profile is None:
+        raise HTTPException(status_code=503, detail="No reference profile loaded. Build one with `python feature_monitor.py <training.csv>`.")
+    profile, started_at, workers = live_profile.collect()
+    report = compare_profiles(reference_profile, profile)
+    report["window_started_at"] = datetime.fromtimestamp(started_at, timezone.utc).isoformat()
+    report["workers"] = workers
+    return report
+
+@app.get("/monitoring/sketches")
+def live_sketches():
+    profile, started_at = live_profile.recent()
+    return {
+        "pid": os.getpid(),
+        "window_started_at": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+        "profile": profile.to_dict()
+    }
+
 @app.post("/predict", response_model=PredictedResponse)
 def predict_premium(user_data: UserData):
     inputs = {
@@ -42,4 +87,6 @@ def predict_premium(user_data: UserData):
     }
     
     prediction = predict_from_model(inputs)
+    prediction_logger.log(inputs, prediction)
+    live_profile.update(inputs, prediction)
     return JSONResponse(status_code=200, content= {"response":prediction})
\ No newline at end of file
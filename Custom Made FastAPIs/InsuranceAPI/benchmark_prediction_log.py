@@ -0,0 +1,153 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model_functions import predict_from_model, MODEL_VERSION
+from prediction_logger import PredictionLogger, CREATE_TABLE, INSERT_ROW, QUEUE_SIZE, BATCH_SIZE, build_row
+
+SAMPLE_INPUTS = [
+    {"bmi": 22.9, "age_group": "adult", "lifestyle_risk": "low", "city_tier": 1, "income_lpa": 12.0, "occupation": "private_job"},
+    {"bmi": 31.2, "age_group": "senior", "lifestyle_risk": "high", "city_tier": 2, "income_lpa": 4.5, "occupation": "retired"},
+    {"bmi": 27.8, "age_group": "young", "lifestyle_risk": "medium", "city_tier": 3, "income_lpa": 1.2, "occupation": "student"},
+    {"bmi": 24.1, "age_group": "middle_aged", "lifestyle_risk": "medium", "city_tier": 1, "income_lpa": 35.0, "occupation": "business_owner"},
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def run(handler, requests, workers):
+    def timed(i):
+        start = time.perf_counter()
+        handler(SAMPLE_INPUTS[i % len(SAMPLE_INPUTS)])
+        return (time.perf_counter() - start) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rate": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Added /predict latency of the prediction log.")
+    parser.add_argument("--requests", type=int, default=500, help="requests per mode per round")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent callers, like uvicorn's threadpool")
+    parser.add_argument("--repeats", type=int, default=3, help="interleaved rounds; the median round is reported")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed requests per mode before the first round")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--block-timeout", type=float, default=1.0, help="max wait for queue room in the block policy run")
+    parser.add_argument("--no-model", action="store_true", help="skip inference to isolate logging cost")
+    args = parser.parse_args()
+
+    if args.no_model:
+        prediction = predict_from_model(SAMPLE_INPUTS[0])
+        predict = lambda inputs: prediction
+    else:
+        predict = predict_from_model
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        # What logging inside predict_premium would cost without the queue:
+        # one insert + commit per request, serialised on a shared connection.
+        conn = sqlite3.connect(os.path.join(log_dir, "sync.db"), check_same_thread=False)
+        conn.execute(CREATE_TABLE)
+        conn_lock = threading.Lock()
+
+        def sync_handler(inputs):
+            prediction = predict(inputs)
+            with conn_lock, conn:
+                conn.execute(INSERT_ROW, build_row(time.time(), MODEL_VERSION, inputs, prediction))
+            return prediction
+
+        loggers = {
+            policy: PredictionLogger(log_dir=os.path.join(log_dir, policy), model_version=MODEL_VERSION,
+                                     queue_size=args.queue_size, batch_size=args.batch_size,
+                                     policy=policy, block_timeout=args.block_timeout)
+            for policy in ("drop", "block")
+        }
+
+        def queued_handler(logger):
+            def handler(inputs):
+                prediction = predict(inputs)
+                logger.log(inputs, prediction)
+                return prediction
+            return handler
+
+        modes = {
+            "no logging": (predict, None),
+            "sync sqlite": (sync_handler, None),
+            "queued drop": (queued_handler(loggers["drop"]), loggers["drop"]),
+            "queued block": (queued_handler(loggers["block"]), loggers["block"]),
+        }
+
+        print(f"{args.requests} requests x {args.repeats} rounds, {args.workers} workers, "
+              f"model {'off' if args.no_model else 'on'}, queue {args.queue_size}, batch {args.batch_size}")
+
+        # One logger runs at a time so its writer's CPU time is attributable.
+        names = list(modes)
+        for name in names:
+            handler, logger = modes[name]
+            if logger:
+                logger.start()
+            run(handler, args.warmup, args.workers)
+            if logger:
+                logger.stop()
+
+        results = {name: [] for name in names}
+        dropped = {name: 0 for name in names}
+        writer_cpu = {name: 0.0 for name in names}
+        queued_wall = {name: 0.0 for name in names}
+        for round_index in range(args.repeats):
+            # Rotate the order every round so drift in machine load is spread
+            # over all modes instead of always hitting the same one.
+            for name in names[round_index % len(names):] + names[:round_index % len(names)]:
+                handler, logger = modes[name]
+                if logger:
+                    logger.writer_cpu_seconds = 0.0
+                    logger.start()
+                    dropped_before = logger.stats()["dropped"]
+                result = run(handler, args.requests, args.workers)
+                results[name].append(result)
+                if logger:
+                    # stop() drains the queue, so the writer's full CPU cost
+                    # for this round is included.
+                    logger.stop()
+                    stats = logger.stats()
+                    dropped[name] += stats["dropped"] - dropped_before
+                    writer_cpu[name] += stats["writer_cpu_seconds"]
+                    queued_wall[name] += result["elapsed"]
+        conn.close()
+
+        attempted = args.requests * args.repeats
+        for name in names:
+            median = lambda key: statistics.median(result[key] for result in results[name])
+            line = (f"{name:<13} {median('rate'):>9.0f} req/s   p50 {median('p50'):8.3f} ms"
+                    f"   p99 {median('p99'):8.3f} ms   dropped {100 * dropped[name] / attempted:5.1f}%")
+            if modes[name][1]:
+                line += (f"   writer CPU {1e6 * writer_cpu[name] / attempted:6.1f} us/row"
+                         f" ({100 * writer_cpu[name] / queued_wall[name]:4.1f}% of wall time)")
+            print(line)
+
+    lost = {name: count for name, count in dropped.items() if count}
+    if lost:
+        print(f"WARNING: the prediction log lost records ({', '.join(f'{name}: {count}' for name, count in lost.items())}). "
+              "Every /predict must be recorded for audits; raise --queue-size/--batch-size or use the block policy.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
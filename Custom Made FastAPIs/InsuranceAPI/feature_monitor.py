@@ -0,0 +1,510 @@
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+
+NUMERIC_FEATURES = ["bmi", "income_lpa"]
+CATEGORICAL_FEATURES = ["age_group", "city_tier", "occupation", "lifestyle_risk"]
+
+REFERENCE_PATH = os.getenv("DRIFT_REFERENCE_PATH", "reference_profile.json")
+MIN_LIVE_SAMPLES = int(os.getenv("DRIFT_MIN_SAMPLES", "100"))
+WINDOW_SECONDS = float(os.getenv("DRIFT_WINDOW_SECONDS", "3600"))
+WINDOW_PREDICTIONS = int(os.getenv("DRIFT_WINDOW_PREDICTIONS", "10000"))
+SKETCH_DIR = os.getenv("DRIFT_SKETCH_DIR", "drift_sketches")
+PUBLISH_SECONDS = float(os.getenv("DRIFT_PUBLISH_SECONDS", "10"))
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.25
+
+
+class QuantileSketch:
+    """Mergeable log-bucket quantile sketch (DDSketch style).
+
+    Every value lands in bucket ceil(log_gamma(value)), so any quantile is
+    returned within `relative_accuracy` of the true value. Memory is capped at
+    `max_bins` buckets by collapsing the lowest ones, and two sketches with the
+    same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_bins=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value):
+        value = float(value)
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + 1
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins + 1
+        folded = sum(self.bins.pop(key) for key in keys[:excess])
+        self.bins[keys[excess]] = self.bins.get(keys[excess], 0) + folded
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    def cdf(self, value):
+        if self.count == 0:
+            return 0.0
+        if value <= 0:
+            return self.zero_count / self.count if value == 0 else 0.0
+        limit = self._key(value)
+        below = self.zero_count + sum(count for key, count in self.bins.items() if key <= limit)
+        return below / self.count
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+
+class ProbabilityHistogram:
+    """Fixed-width histogram of one class's predicted probability on [0, 1]."""
+
+    def __init__(self, bins=20):
+        self.counts = [0] * bins
+
+    def add(self, probability):
+        index = min(int(float(probability) * len(self.counts)), len(self.counts) - 1)
+        self.counts[index] += 1
+
+    def merge(self, other):
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge probability histograms with different bin counts")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+
+class FeatureProfile:
+    """Constant-memory summary of model inputs and outputs.
+
+    Used both for the live traffic of one worker and for the training-set
+    reference. `update()` is O(1) per prediction; profiles from several
+    workers combine with `merge()` or via their `to_dict()` form.
+    """
+
+    def __init__(self, relative_accuracy=0.01, probability_bins=20):
+        self.relative_accuracy = relative_accuracy
+        self.probability_bins = probability_bins
+        self.numeric = {name: QuantileSketch(relative_accuracy) for name in NUMERIC_FEATURES}
+        self.categorical = {name: Counter() for name in CATEGORICAL_FEATURES}
+        self.predicted = Counter()
+        self.probabilities = {}
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return self.numeric[NUMERIC_FEATURES[0]].count
+
+    def update(self, inputs: dict, prediction: dict = None):
+        with self._lock:
+            for name in NUMERIC_FEATURES:
+                self.numeric[name].add(inputs[name])
+            for name in CATEGORICAL_FEATURES:
+                self.categorical[name][str(inputs[name])] += 1
+            if prediction is None:
+                return
+            self.predicted[str(prediction["predicted_category"])] += 1
+            for label, probability in prediction["class_probabilities"].items():
+                if label not in self.probabilities:
+                    self.probabilities[label] = ProbabilityHistogram(self.probability_bins)
+                self.probabilities[label].add(probability)
+
+    def merge(self, other):
+        with self._lock:
+            for name in NUMERIC_FEATURES:
+                self.numeric[name].merge(other.numeric[name])
+            for name in CATEGORICAL_FEATURES:
+                self.categorical[name].update(other.categorical[name])
+            self.predicted.update(other.predicted)
+            for label, histogram in other.probabilities.items():
+                if label not in self.probabilities:
+                    self.probabilities[label] = ProbabilityHistogram(self.probability_bins)
+                self.probabilities[label].merge(histogram)
+        return self
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "relative_accuracy": self.relative_accuracy,
+                "probability_bins": self.probability_bins,
+                "numeric": {name: sketch.to_dict() for name, sketch in self.numeric.items()},
+                "categorical": {name: dict(counts) for name, counts in self.categorical.items()},
+                "predicted": dict(self.predicted),
+                "probabilities": {label: list(histogram.counts) for label, histogram in self.probabilities.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data["relative_accuracy"], data["probability_bins"])
+        profile.numeric = {name: QuantileSketch.from_dict(sketch) for name, sketch in data["numeric"].items()}
+        profile.categorical = {name: Counter(counts) for name, counts in data["categorical"].items()}
+        profile.predicted = Counter(data["predicted"])
+        for label, counts in data["probabilities"].items():
+            histogram = ProbabilityHistogram(len(counts))
+            histogram.counts = list(counts)
+            profile.probabilities[label] = histogram
+        return profile
+
+    @classmethod
+    def from_dataframe(cls, df, model=None):
+        profile = cls()
+        features = df[NUMERIC_FEATURES + CATEGORICAL_FEATURES]
+        rows = features.to_dict("records")
+        if model is None:
+            for row in rows:
+                profile.update(row)
+            return profile
+
+        labels = model.classes_.tolist()
+        for row, predicted_class, probabilities in zip(rows, model.predict(features), model.predict_proba(features)):
+            profile.update(row, {
+                "predicted_category": predicted_class,
+                "class_probabilities": dict(zip(labels, probabilities)),
+            })
+        return profile
+
+    def snapshot(self):
+        return FeatureProfile.from_dict(self.to_dict())
+
+
+def merge_profiles(profiles):
+    """Combine `FeatureProfile.to_dict()` payloads from several workers."""
+    merged = None
+    for data in profiles:
+        profile = FeatureProfile.from_dict(data)
+        merged = profile if merged is None else merged.merge(profile)
+    return merged
+
+
+class WindowedProfile:
+    """Live profile over a rotating window instead of the whole uptime.
+
+    Predictions go into a current `FeatureProfile`; once it is
+    `window_seconds` old or holds `window_predictions` rows it becomes the
+    previous window and a fresh one starts. `recent()` merges the two, so
+    drift is always judged on the last one to two windows of traffic and a
+    recent shift is not diluted by hours of older requests.
+
+    With several uvicorn workers each process only sees its share of the
+    traffic. `publish()` writes this worker's recent window to `sketch_dir`
+    (one file per pid) and `collect()` merges every worker's file that is
+    fresh enough, which is what `/monitoring/drift` compares.
+    """
+
+    def __init__(self, window_seconds=WINDOW_SECONDS, window_predictions=WINDOW_PREDICTIONS,
+                 sketch_dir=SKETCH_DIR, publish_seconds=PUBLISH_SECONDS):
+        self.window_seconds = window_seconds
+        self.window_predictions = window_predictions
+        self.sketch_dir = sketch_dir
+        self.publish_seconds = publish_seconds
+        self.current = FeatureProfile()
+        self.current_started_at = time.time()
+        self.previous = None
+        self.previous_started_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._publisher = None
+
+    def _rotate_if_needed(self):
+        now = time.time()
+        if (now - self.current_started_at < self.window_seconds
+                and self.current.count < self.window_predictions):
+            return
+        # A previous window older than two windows is stale: traffic paused.
+        stale = now - self.current_started_at >= 2 * self.window_seconds
+        self.previous = None if stale else self.current
+        self.previous_started_at = None if stale else self.current_started_at
+        self.current = FeatureProfile()
+        self.current_started_at = now
+
+    def update(self, inputs: dict, prediction: dict):
+        with self._lock:
+            self._rotate_if_needed()
+            current = self.current
+        current.update(inputs, prediction)
+
+    def recent(self):
+        """Snapshot of the previous + current window and when it started."""
+        with self._lock:
+            self._rotate_if_needed()
+            current, previous = self.current, self.previous
+            started_at = self.previous_started_at if previous is not None else self.current_started_at
+        profile = current.snapshot()
+        if previous is not None:
+            profile.merge(previous.snapshot())
+        return profile, started_at
+
+    def _path(self):
+        return os.path.join(self.sketch_dir, f"worker_{os.getpid()}.json")
+
+    def publish(self):
+        profile, started_at = self.recent()
+        payload = {
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+            "window_started_at": started_at,
+            "profile": profile.to_dict(),
+        }
+        os.makedirs(self.sketch_dir, exist_ok=True)
+        temporary = self._path() + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(payload, f)
+        os.replace(temporary, self._path())
+
+    def collect(self):
+        """Merge the recent windows of every worker that published lately."""
+        if not self.sketch_dir:
+            profile, started_at = self.recent()
+            return profile, started_at, 1
+        try:
+            self.publish()
+            names = os.listdir(self.sketch_dir)
+        except OSError:
+            # Shared dir unusable: fall back to this worker's own window.
+            profile, started_at = self.recent()
+            return profile, started_at, 1
+        max_age = 2 * self.window_seconds
+        profiles, starts = [], []
+        for name in names:
+            if not (name.startswith("worker_") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.sketch_dir, name), "r") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if time.time() - payload["updated_at"] > max_age:
+                continue
+            profiles.append(payload["profile"])
+            starts.append(payload["window_started_at"])
+        return merge_profiles(profiles), min(starts), len(profiles)
+
+    def start_publishing(self):
+        if not self.sketch_dir or self._publisher is not None:
+            return
+        self._stop.clear()
+        self._publisher = threading.Thread(target=self._publish_loop, name="drift-publisher", daemon=True)
+        self._publisher.start()
+
+    def stop_publishing(self):
+        if self._publisher is None:
+            return
+        self._stop.set()
+        self._publisher.join(self.publish_seconds)
+        self._publisher = None
+        try:
+            self.publish()
+        except OSError:
+            pass
+
+    def _publish_loop(self):
+        while not self._stop.wait(self.publish_seconds):
+            try:
+                self.publish()
+            except OSError:
+                pass
+
+
+def population_stability_index(expected, actual, floor=1e-4):
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, floor), max(a, floor)
+        psi += (a - e) * math.log(a / e)
+    return round(psi, 4)
+
+
+def _status(psi):
+    if psi >= PSI_DRIFT:
+        return "drift"
+    if psi >= PSI_WARNING:
+        return "warning"
+    return "stable"
+
+
+def _frequencies(counts, keys):
+    total = sum(counts.values())
+    return [counts.get(key, 0) / total if total else 0.0 for key in keys]
+
+
+def _compare_numeric(reference, live, buckets=10):
+    edges = sorted({reference.quantile(i / buckets) for i in range(1, buckets)})
+    ref_cdf = [0.0] + [reference.cdf(edge) for edge in edges] + [1.0]
+    live_cdf = [0.0] + [live.cdf(edge) for edge in edges] + [1.0]
+    psi = population_stability_index(
+        [b - a for a, b in zip(ref_cdf, ref_cdf[1:])],
+        [b - a for a, b in zip(live_cdf, live_cdf[1:])],
+    )
+    summary = lambda sketch: {
+        "p10": sketch.quantile(0.1),
+        "median": sketch.quantile(0.5),
+        "p90": sketch.quantile(0.9),
+        "mean": sketch.total / sketch.count if sketch.count else None,
+    }
+    return {"psi": psi, "status": _status(psi), "reference": summary(reference), "live": summary(live)}
+
+
+def _compare_counts(reference, live):
+    keys = sorted(set(reference) | set(live))
+    expected, actual = _frequencies(reference, keys), _frequencies(live, keys)
+    psi = population_stability_index(expected, actual)
+    return {
+        "psi": psi,
+        "status": _status(psi),
+        "reference": dict(zip(keys, map(lambda p: round(p, 4), expected))),
+        "live": dict(zip(keys, map(lambda p: round(p, 4), actual))),
+    }
+
+
+def _compare_histograms(reference, live):
+    ref_total, live_total = sum(reference.counts), sum(live.counts)
+    psi = population_stability_index(
+        [c / ref_total if ref_total else 0.0 for c in reference.counts],
+        [c / live_total if live_total else 0.0 for c in live.counts],
+    )
+    return {"psi": psi, "status": _status(psi)}
+
+
+def compare_profiles(reference: FeatureProfile, live: FeatureProfile, min_samples=MIN_LIVE_SAMPLES):
+    report = {
+        "live_samples": live.count,
+        "reference_samples": reference.count,
+        "features": {},
+        "predictions": {},
+    }
+    if live.count < min_samples:
+        report["status"] = "insufficient_data"
+        report["drift_detected"] = False
+        return report
+
+    for name in NUMERIC_FEATURES:
+        report["features"][name] = _compare_numeric(reference.numeric[name], live.numeric[name])
+    for name in CATEGORICAL_FEATURES:
+        report["features"][name] = _compare_counts(reference.categorical[name], live.categorical[name])
+    if reference.predicted:
+        report["predictions"]["predicted_category"] = _compare_counts(reference.predicted, live.predicted)
+    for label, histogram in reference.probabilities.items():
+        if label in live.probabilities:
+            report["predictions"][f"probability_{label}"] = _compare_histograms(histogram, live.probabilities[label])
+
+    statuses = [entry["status"] for group in ("features", "predictions") for entry in report[group].values()]
+    report["status"] = "drift" if "drift" in statuses else "warning" if "warning" in statuses else "stable"
+    report["drift_detected"] = report["status"] == "drift"
+    return report
+
+
+def load_reference(path=REFERENCE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        profile = FeatureProfile.from_dict(json.load(f))
+    if profile.count == 0:
+        # An empty reference has no quantiles to bucket live traffic by.
+        raise ValueError(f"Reference profile {path} is empty; rebuild it from a non-empty training CSV with `python feature_monitor.py <training.csv>`")
+    return profile
+
+
+def _derive_features(df):
+    # Raw training rows go through the same computed fields the API uses.
+    from pydantic_setup import UserData
+    import pandas as pd
+
+    records = [UserData(**row).model_dump() for row in df.to_dict("records")]
+    return pd.DataFrame(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the drift reference profile from the training set.")
+    parser.add_argument("training_csv", help="training data, either model features or raw UserData columns")
+    parser.add_argument("-o", "--output", default=REFERENCE_PATH)
+    parser.add_argument("--no-model", action="store_true", help="skip prediction and probability profiles")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    df = pd.read_csv(args.training_csv)
+    if df.empty:
+        parser.error(f"{args.training_csv} has no rows; a drift reference needs training data")
+    if not set(NUMERIC_FEATURES + CATEGORICAL_FEATURES).issubset(df.columns):
+        df = _derive_features(df)
+
+    model = None
+    if not args.no_model:
+        from model_functions import model
+
+    profile = FeatureProfile.from_dataframe(df, model)
+    with open(args.output, "w") as f:
+        json.dump(profile.to_dict(), f)
+    print(f"Wrote reference profile for {profile.count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+LOG_DIR = os.getenv("PREDICTION_LOG_DIR", "prediction_logs")
+QUEUE_SIZE = int(os.getenv("PREDICTION_LOG_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("PREDICTION_LOG_BATCH_SIZE", "500"))
+FLUSH_INTERVAL = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "1.0"))
+MAX_FILE_BYTES = int(os.getenv("PREDICTION_LOG_MAX_FILE_MB", "64")) * 1024 * 1024
+ROTATE_SECONDS = float(os.getenv("PREDICTION_LOG_ROTATE_SECONDS", "3600"))
+FULL_POLICY = os.getenv("PREDICTION_LOG_POLICY", "drop")
+BLOCK_TIMEOUT = float(os.getenv("PREDICTION_LOG_BLOCK_TIMEOUT", "0.05"))
+STOP_TIMEOUT = float(os.getenv("PREDICTION_LOG_STOP_TIMEOUT", "10.0"))
+
+FEATURE_COLUMNS = ["bmi", "age_group", "lifestyle_risk", "city_tier", "income_lpa", "occupation"]
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS predictions (
+    logged_at REAL,
+    model_version TEXT,
+    bmi REAL,
+    age_group TEXT,
+    lifestyle_risk TEXT,
+    city_tier INTEGER,
+    income_lpa REAL,
+    occupation TEXT,
+    predicted_category TEXT,
+    confidence REAL,
+    class_probabilities TEXT
+)
+""".strip()
+
+INSERT_ROW = "INSERT INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+_STOP = object()
+
+
+def build_row(logged_at, model_version, inputs, prediction):
+    return (
+        logged_at,
+        model_version,
+        *(inputs.get(column) for column in FEATURE_COLUMNS),
+        str(prediction["predicted_category"]),
+        float(prediction["confidence"]),
+        json.dumps({label: float(p) for label, p in prediction["class_probabilities"].items()}),
+    )
+
+
+class PredictionLogger:
+    """Non-blocking prediction log.
+
+    Handlers call `log()`, which only puts a record on a bounded queue. A
+    background thread batches records and writes them to SQLite files with one
+    `executemany` + commit per batch, rotating to a new file by size or age.
+    When the queue is full the record is dropped (`policy="drop"`) or the
+    caller waits up to `block_timeout` seconds for room (`policy="block"`).
+    A batch that fails to write is counted in `stats()` and the writer keeps
+    consuming, so one bad write never stalls the handlers or shutdown.
+    """
+
+    def __init__(self, log_dir=LOG_DIR, model_version=None, queue_size=QUEUE_SIZE,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_file_bytes=MAX_FILE_BYTES, rotate_seconds=ROTATE_SECONDS,
+                 policy=FULL_POLICY, block_timeout=BLOCK_TIMEOUT):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown prediction log policy: {policy!r} (expected 'drop' or 'block')")
+        self.log_dir = log_dir
+        self.model_version = model_version
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.rotate_seconds = rotate_seconds
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._conn = None
+        self._path = None
+        self._opened_at = 0.0
+        self._counter_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.files = 0
+        self.failed_batches = 0
+        self.failed_rows = 0
+        self.last_error = None
+        self.writer_cpu_seconds = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        # The sentinel lands after every queued record, so the writer drains
+        # the queue before it exits. Both waits are bounded so a stuck writer
+        # cannot hang the app's shutdown.
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def log(self, inputs: dict, prediction: dict) -> bool:
+        record = (time.time(), inputs, prediction)
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+        with self._counter_lock:
+            self.enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            enqueued, dropped = self.enqueued, self.dropped
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "policy": self.policy,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": enqueued,
+            "dropped": dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "files": self.files,
+            "failed_batches": self.failed_batches,
+            "failed_rows": self.failed_rows,
+            "last_error": self.last_error,
+            "writer_cpu_seconds": round(self.writer_cpu_seconds, 4),
+            "current_file": self._path,
+        }
+
+    def _run(self):
+        # CPU time of this thread bounds how long it can hold the GIL away
+        # from the request handlers.
+        cpu_started = time.thread_time()
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                record = None
+
+            if record is _STOP:
+                self._safe_flush(batch)
+                self._close()
+                self.writer_cpu_seconds = time.thread_time() - cpu_started
+                return
+            if record is not None:
+                batch.append(record)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._safe_flush(batch)
+                self.writer_cpu_seconds = time.thread_time() - cpu_started
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _safe_flush(self, batch):
+        try:
+            self._flush(batch)
+        except Exception as error:
+            self.failed_batches += 1
+            self.failed_rows += len(batch)
+            self.last_error = f"{type(error).__name__}: {error}"
+            # Start a fresh file on the next batch instead of reusing a
+            # connection that may be broken.
+            try:
+                self._close()
+            except Exception:
+                self._conn = None
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        self._rotate_if_needed()
+        rows = [build_row(logged_at, self.model_version, inputs, prediction) for logged_at, inputs, prediction in batch]
+        self._conn.executemany(INSERT_ROW, rows)
+        self._conn.commit()
+        self.written += len(rows)
+        self.batches += 1
+
+    def _rotate_if_needed(self):
+        if self._conn is not None:
+            too_old = time.monotonic() - self._opened_at >= self.rotate_seconds
+            too_big = os.path.getsize(self._path) >= self.max_file_bytes
+            if not (too_old or too_big):
+                return
+            self._close()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self._path = os.path.join(self.log_dir, f"predictions_{stamp}.db")
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(CREATE_TABLE)
+        self._opened_at = time.monotonic()
+        self.files += 1
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
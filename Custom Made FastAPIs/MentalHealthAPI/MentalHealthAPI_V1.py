@@ -0,0 +1,47 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from typing import List
+import pandas as pd
+from pydantic_setup import SurveyData
+from response_model import PredictedResponse, BatchPredictedResponse
+from model_functions import predict_from_model, predict_batch, to_response, MODEL_VERSION, model
+
+app = FastAPI(
+    title="🧠 Mental Health Treatment Predictor API",
+    description="""
+    Welcome to the Mental Health Treatment Predictor API — serving the `treatment` classifier trained in
+    Mental_Health_Analyzer.ipynb on the workplace mental health survey.
+
+    🚀 Features:
+    - Free-text Gender normalisation, NA filling, label encoding and Age scaling frozen from the notebook
+    - Single-survey and batched predictions through the same vectorised preprocessing
+    - Offline scoring of large survey CSVs with batch_score.py
+
+    Built for speed. Designed for clarity. Ready for production.
+    """.strip(),
+    version="1.0"
+)
+
+MAX_BATCH_SIZE = 1000
+
+@app.get("/")
+def home():
+    return {"message": "Welcome to the Mental Health Treatment Predictor API. Use the /predict endpoint to get predictions."}
+
+@app.get("/health")
+def health_check():
+    return {"status": "OK", "version": MODEL_VERSION, "model_version": model is not None}
+
+@app.post("/predict", response_model=PredictedResponse)
+def predict_treatment(survey: SurveyData):
+    prediction = predict_from_model(survey.model_dump())
+    return JSONResponse(status_code=200, content={"response": prediction})
+
+@app.post("/predict/batch", response_model=BatchPredictedResponse)
+def predict_treatment_batch(surveys: List[SurveyData]):
+    if len(surveys) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} surveys per request; score larger files offline with batch_score.py")
+    if not surveys:
+        return JSONResponse(status_code=200, content={"response": []})
+    predicted, probabilities = predict_batch(pd.DataFrame([survey.model_dump() for survey in surveys]))
+    return JSONResponse(status_code=200, content={"response": [to_response(c, p) for c, p in zip(predicted, probabilities)]})
@@ -0,0 +1,47 @@
+import argparse
+import time
+import pandas as pd
+from survey_preprocessing import FEATURE_COLUMNS, CATEGORICAL_COLUMNS
+from model_functions import predict_batch, class_labels, preprocessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a survey CSV with the treatment classifier, chunk by chunk.")
+    parser.add_argument("input_csv")
+    parser.add_argument("-o", "--output", default="treatment_predictions.csv")
+    parser.add_argument("--chunksize", type=int, default=50000, help="rows held in memory at once")
+    args = parser.parse_args()
+
+    # Only the model's columns are parsed; categoricals stay strings so every
+    # chunk sees the same dtypes regardless of its content.
+    reader = pd.read_csv(args.input_csv, usecols=FEATURE_COLUMNS, chunksize=args.chunksize,
+                         dtype={column: str for column in CATEGORICAL_COLUMNS})
+
+    output_columns = ["row", "treatment"] + [f"probability_{label}" for label in class_labels] + ["unknown_fields"]
+    rows = 0
+    started = time.perf_counter()
+    for chunk in reader:
+        if chunk.empty:
+            continue
+        predicted, probabilities = predict_batch(chunk)
+        result = pd.DataFrame({"row": chunk.index, "treatment": predicted})
+        for index, label in enumerate(class_labels):
+            result[f"probability_{label}"] = probabilities[:, index].round(4)
+        # Unrecognised answers were scored with their column's most frequent
+        # code; list those columns rather than pass that guess off as real.
+        unknown = preprocessor.unknown_values(chunk)
+        result["unknown_fields"] = unknown.dot(unknown.columns + ";").str.rstrip(";").to_numpy()
+        result.to_csv(args.output, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+        rows += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"{rows} rows scored, {rows / elapsed:.0f} rows/sec")
+
+    if rows == 0:
+        pd.DataFrame(columns=output_columns).to_csv(args.output, index=False)
+
+    elapsed = time.perf_counter() - started
+    print(f"Done: {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import pickle
+import numpy as np
+import pandas as pd
+from survey_preprocessing import SurveyPreprocessor
+
+with open("Mental_Health_Model.pkl", "rb") as f:
+    model = pickle.load(f)
+
+preprocessor = SurveyPreprocessor.load("Mental_Health_Preprocessor.json")
+
+MODEL_VERSION = "1.0"
+
+class_labels = [preprocessor.target_classes[code] for code in model.classes_]
+
+def predict_batch(df):
+    features = preprocessor.transform(df)
+    probabilities = model.predict_proba(features)
+    predicted = np.asarray(class_labels)[probabilities.argmax(axis=1)]
+    return predicted, probabilities
+
+def to_response(predicted_class, probabilities):
+    class_probs = dict(zip(class_labels, map(lambda p: round(float(p), 4), probabilities)))
+    return {
+        "predicted_treatment": str(predicted_class),
+        "confidence": round(float(max(probabilities)), 4),
+        "class_probabilities": class_probs
+        }
+
+def predict_from_model(user_input: dict):
+    predicted, probabilities = predict_batch(pd.DataFrame([user_input]))
+    return to_response(predicted[0], probabilities[0])
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Annotated, Optional
+from survey_preprocessing import MALE_STR, TRANS_STR, FEMALE_STR
+
+KNOWN_GENDERS = {value.strip() for value in MALE_STR + TRANS_STR + FEMALE_STR}
+
+class SurveyData(BaseModel):
+    Age: Annotated[int, Field(gt=0, lt=120, description="Age of the respondent in years", example=32)]
+    Gender: Annotated[str, Field(description="Gender as free text, normalised to male/female/trans (unrecognised answers are rejected)", example="Female")]
+    family_history: Annotated[Literal["Yes", "No"], Field(description="Family history of mental illness", example="No")]
+    benefits: Annotated[Literal["Yes", "No", "Don't know"], Field(description="Employer provides mental health benefits", example="Yes")]
+    care_options: Annotated[Literal["Yes", "No", "Not sure"], Field(description="Knows the mental health care options of the employer", example="Not sure")]
+    anonymity: Annotated[Literal["Yes", "No", "Don't know"], Field(description="Anonymity is protected when using treatment resources", example="Don't know")]
+    leave: Annotated[Literal["Very easy", "Somewhat easy", "Don't know", "Somewhat difficult", "Very difficult"], Field(description="How easy it is to take medical leave for a mental health condition", example="Somewhat easy")]
+    work_interfere: Annotated[Optional[Literal["Never", "Rarely", "Sometimes", "Often"]], Field(default=None, description="How often a mental health condition interferes with work", example="Sometimes")]
+
+    @field_validator("Gender")
+    def validate_gender(cls, value):
+        value = value.strip()
+        if value.lower() not in KNOWN_GENDERS:
+            raise ValueError("Unrecognised Gender answer; use e.g. 'male', 'female', 'trans-female', 'non-binary' or 'genderqueer'")
+        return value
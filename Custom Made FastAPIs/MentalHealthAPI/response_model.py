@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+
+class PredictedResponse(BaseModel):
+    predicted_treatment: str = Field(description="Whether the respondent is predicted to seek treatment.", example="Yes")
+    confidence: float = Field(description="Confidence level of the prediction.", example=0.81)
+    class_probabilities: Dict[str, float] = Field(description="Probabilities for each treatment class.", example={"No": 0.19, "Yes": 0.81})
+
+class BatchPredictedResponse(BaseModel):
+    response: List[PredictedResponse] = Field(description="One prediction per submitted survey, in request order.")
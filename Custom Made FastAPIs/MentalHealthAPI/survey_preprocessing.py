@@ -0,0 +1,121 @@
+import json
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ['Age', 'Gender', 'family_history', 'benefits', 'care_options', 'anonymity', 'leave', 'work_interfere']
+CATEGORICAL_COLUMNS = FEATURE_COLUMNS[1:]
+TARGET_COLUMN = 'treatment'
+
+# Free-text Gender groups from Mental_Health_Analyzer.ipynb (matched on the lower-cased answer)
+MALE_STR = ["male", "m", "male-ish", "maile", "mal", "male (cis)", "make", "male ", "man", "msle", "mail", "malr", "cis man", "cis male"]
+TRANS_STR = ["trans-female", "something kinda male?", "queer/she/they", "non-binary", "nah", "all", "enby", "fluid", "genderqueer", "androgyne", "agender", "male leaning androgynous", "guy (-ish) ^_^", "trans woman", "neuter", "female (trans)", "queer", "ostensibly male, unsure what that really means"]
+FEMALE_STR = ["cis female", "f", "female", "woman", "femake", "female ", "cis-female/femme", "female (cis)", "femail"]
+GENDER_NOISE = ['A little about you', 'p']
+
+DEFAULT_STRING = 'NaN'
+NA_REPLACEMENTS = {'work_interfere': "Don't know"}
+
+
+class SurveyPreprocessor:
+    """The notebook's survey cleaning, fitted once and frozen.
+
+    `fit()` learns the Age median, the label-encoding lookup table of every
+    feature and the Age min/max scaling; `transform()` replays them on any
+    number of rows with vectorised pandas/numpy operations only. Categories
+    never seen in training fall back to the column's most frequent code (for
+    Gender that means `male`), so callers should reject or flag the values
+    `unknown_values()` marks instead of passing that guess off as an answer.
+    """
+
+    def __init__(self):
+        self.gender_map = {value: 'male' for value in MALE_STR}
+        self.gender_map.update({value: 'trans' for value in TRANS_STR})
+        self.gender_map.update({value: 'female' for value in FEMALE_STR})
+        self.age_median = None
+        self.age_values = None
+        self.lookup = {}
+        self.defaults = {}
+        self.target_classes = None
+
+    def _clean(self, df):
+        df = df.copy()
+        for column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].fillna(DEFAULT_STRING).astype(str)
+        for column, value in NA_REPLACEMENTS.items():
+            df[column] = df[column].replace(DEFAULT_STRING, value)
+        df['Gender'] = self.normalize_gender(df['Gender'])
+        df['Age'] = pd.to_numeric(df['Age'], errors='coerce').fillna(0)
+        return df
+
+    def normalize_gender(self, gender):
+        stripped = gender.astype(str).str.strip()
+        return stripped.str.lower().map(self.gender_map).fillna(stripped)
+
+    def unknown_values(self, df):
+        cleaned = self._clean(df)
+        return pd.DataFrame({column: ~cleaned[column].isin(self.lookup[column]) for column in CATEGORICAL_COLUMNS},
+                            index=df.index)
+
+    def _clip_age(self, age):
+        return age.where((age >= 18) & (age <= 120), self.age_median)
+
+    def fit(self, df):
+        df = self._clean(df)
+        df = df[~df['Gender'].isin(GENDER_NOISE)]
+        self.age_median = float(df['Age'].median())
+        age = self._clip_age(df['Age'])
+        self.age_values = np.sort(age.unique()).tolist()
+        for column in CATEGORICAL_COLUMNS:
+            classes = sorted(df[column].unique())
+            self.lookup[column] = {value: code for code, value in enumerate(classes)}
+            self.defaults[column] = self.lookup[column][df[column].mode()[0]]
+        self.target_classes = sorted(df[TARGET_COLUMN].unique())
+        return self
+
+    def transform(self, df):
+        df = self._clean(df)
+        features = pd.DataFrame(index=df.index)
+        # LabelEncoder on Age followed by MinMaxScaler == rank among the
+        # training ages divided by the largest rank. That only holds for ages
+        # seen in training: the notebook's encoder would raise on any other
+        # age. Here unseen ages inside the training range (52, 59, 63, 64,
+        # 66-71) take the rank of the next larger training age, and ages above
+        # the oldest respondent (72) are capped at the largest rank, i.e. 1.0.
+        ranks = np.searchsorted(self.age_values, self._clip_age(df['Age']).to_numpy())
+        features['Age'] = np.minimum(ranks, len(self.age_values) - 1) / (len(self.age_values) - 1)
+        for column in CATEGORICAL_COLUMNS:
+            features[column] = df[column].map(self.lookup[column]).fillna(self.defaults[column]).astype(np.int64)
+        return features[FEATURE_COLUMNS]
+
+    def encode_target(self, series):
+        return series.map({label: code for code, label in enumerate(self.target_classes)})
+
+    def to_dict(self):
+        return {
+            "gender_map": self.gender_map,
+            "age_median": self.age_median,
+            "age_values": self.age_values,
+            "lookup": self.lookup,
+            "defaults": self.defaults,
+            "target_classes": self.target_classes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        preprocessor = cls()
+        preprocessor.gender_map = data["gender_map"]
+        preprocessor.age_median = data["age_median"]
+        preprocessor.age_values = data["age_values"]
+        preprocessor.lookup = data["lookup"]
+        preprocessor.defaults = data["defaults"]
+        preprocessor.target_classes = data["target_classes"]
+        return preprocessor
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
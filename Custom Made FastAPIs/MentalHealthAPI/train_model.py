@@ -0,0 +1,35 @@
+import argparse
+import pickle
+import pandas as pd
+from sklearn.ensemble import AdaBoostClassifier
+from survey_preprocessing import SurveyPreprocessor, GENDER_NOISE, TARGET_COLUMN
+
+SURVEY_PATH = "../../Algorithm Files/Datasets/survey.csv"
+MODEL_PATH = "Mental_Health_Model.pkl"
+PREPROCESSOR_PATH = "Mental_Health_Preprocessor.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the survey preprocessing and the treatment classifier.")
+    parser.add_argument("--survey", default=SURVEY_PATH)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.survey)
+    preprocessor = SurveyPreprocessor().fit(df)
+    # Same rows the notebook keeps after its Gender cleaning
+    df = df[~df['Gender'].isin(GENDER_NOISE)]
+    X = preprocessor.transform(df)
+    y = preprocessor.encode_target(df[TARGET_COLUMN])
+
+    # Final model of Mental_Health_Analyzer.ipynb, fitted on the full survey
+    model = AdaBoostClassifier(random_state=0)
+    model.fit(X, y)
+
+    preprocessor.save(PREPROCESSOR_PATH)
+    with open(MODEL_PATH, "wb") as f:
+        pickle.dump(model, f)
+    print(f"Trained on {len(X)} rows, training accuracy {model.score(X, y):.4f}")
+
+
+if __name__ == "__main__":
+    main()